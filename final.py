@@ -4,8 +4,14 @@ from tkinter import *
 import numpy as np
 import pandas as pd
 import joblib
-from pathlib import Path
+import atexit
+import csv
 import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
 logging.basicConfig(
@@ -26,28 +32,80 @@ FIELD_RANGES = {
     'Age': (0, 120)
 }
 
+# Field order and bounds as arrays, plus a reusable model input buffer
+_FIELDS = tuple(FIELD_RANGES.keys())
+_MIN = np.array([FIELD_RANGES[f][0] for f in _FIELDS], dtype=np.float64)
+_MAX = np.array([FIELD_RANGES[f][1] for f in _FIELDS], dtype=np.float64)
+_INPUT_BUF = np.empty((1, len(_FIELDS)), dtype=np.float64)
+
+# Rows read per chunk during batch prediction
+BATCH_CHUNK_SIZE = 50_000
+
+# Process umask, read once here since os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Single background worker for model warm-up and batch prediction
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Saved predictions are buffered and appended to the CSV in batches
+PREDICTION_FLUSH_ROWS = 32
+_PENDING_ROWS = []
+_PENDING_LOCK = threading.Lock()
+_CSV_FH = None
+_CSV_WRITER = None
+
+# Current theme, tracked here so toggling doesn't have to query Tk
+_dark_theme = False
+
+# Input-form labels recolored by apply_theme, collected as they are built
+_LABEL_WIDGETS = []
+
 
 def load_model(model_path='diabetes_model.pkl'):
+    """Start unpickling the model on the background worker; returns a future."""
+    return _EXECUTOR.submit(joblib.load, model_path)
+
+
+# Begin loading at import so the model is usually ready by the time the user logs in
+model = None
+_MODEL_FUTURE = load_model()
+
+
+def _check_model_ready():
+    global model
+    if not _MODEL_FUTURE.done():
+        window.after(50, _check_model_ready)
+        return
+
     try:
-        return joblib.load(model_path)
+        model = _MODEL_FUTURE.result()
     except Exception as e:
         logging.error(f"Error loading model: {e}")
         messagebox.showerror("Error", f"Failed to load model: {e}")
-        return None
+        return
+
+    # Warm the model up in the background so the first click is fast
+    _EXECUTOR.submit(model.predict_proba, np.zeros((1, len(_FIELDS))))
+    predict_button.config(state=tk.NORMAL)
+    batch_button.config(state=tk.NORMAL)
 
 
 def validate_inputs():
-    values = {}
-    for field, var in zip(FIELD_RANGES.keys(), entry_vars):
+    row = _INPUT_BUF[0]
+    for idx, (field, var) in enumerate(zip(_FIELDS, entry_vars)):
         try:
-            value = float(var.get())
-            min_val, max_val = FIELD_RANGES[field]
-            if not min_val <= value <= max_val:
-                raise ValueError(f"{field} must be between {min_val} and {max_val}")
-            values[field] = value
+            row[idx] = float(var.get())
         except ValueError as e:
             raise ValueError(f"Invalid {field}: {str(e)}")
-    return values
+
+    # Written as a negated in-range test so NaN entries are rejected too
+    bad = ~((row >= _MIN) & (row <= _MAX))
+    if bad.any():
+        field = _FIELDS[int(bad.argmax())]
+        min_val, max_val = FIELD_RANGES[field]
+        raise ValueError(f"Invalid {field}: {field} must be between {min_val} and {max_val}")
+    return _INPUT_BUF
 
 
 def predict_diabetes():
@@ -56,12 +114,14 @@ def predict_diabetes():
         return
 
     try:
-        values = validate_inputs()
-        input_data = np.array([[values[field] for field in FIELD_RANGES.keys()]])
+        input_data = validate_inputs()
 
-        prediction = model.predict(input_data)
-        probability = model.predict_proba(input_data)[0][1]
+        proba = model.predict_proba(input_data)
+        prediction = model.classes_[proba.argmax(axis=1)]
+        probability = proba[0][1]
 
+        # The per-field dict is only needed for display and the saved CSV row
+        values = dict(zip(_FIELDS, input_data[0].tolist()))
         outcome = "Diabetic" if prediction[0] == 1 else "Non-Diabetic"
         show_prediction_result(outcome, probability, values)
         save_prediction(outcome, values)
@@ -109,21 +169,80 @@ def show_prediction_result(outcome, probability, values):
 def save_prediction(outcome, values):
     try:
         values['Outcome'] = outcome
-        df = pd.DataFrame([values])
-
-        file_path = Path("diabetes_predictions.csv")
-        df.to_csv(
-            file_path,
-            mode='a',
-            header=not file_path.exists(),
-            index=False
-        )
-        logging.info(f"Prediction saved: {values}")
+        with _PENDING_LOCK:
+            _PENDING_ROWS.append(values)
+            pending = len(_PENDING_ROWS)
+
+        logging.info(f"Prediction buffered: {values}")
+        if pending >= PREDICTION_FLUSH_ROWS:
+            flush_predictions()
     except Exception as e:
         logging.error(f"Error saving prediction: {e}")
         messagebox.showerror("Save Error", f"Could not save prediction: {e}")
 
 
+def _prediction_writer():
+    global _CSV_FH, _CSV_WRITER
+    if _CSV_WRITER is None:
+        _CSV_FH = open("diabetes_predictions.csv", 'a', newline='')
+        _CSV_WRITER = csv.DictWriter(_CSV_FH, fieldnames=list(_FIELDS) + ['Outcome'])
+        if _CSV_FH.tell() == 0:
+            _CSV_WRITER.writeheader()
+    return _CSV_WRITER
+
+
+def flush_predictions():
+    global _PENDING_ROWS
+    with _PENDING_LOCK:
+        rows, _PENDING_ROWS = _PENDING_ROWS, []
+    if not rows:
+        return
+
+    try:
+        _prediction_writer().writerows(rows)
+        _CSV_FH.flush()
+    except Exception:
+        # Put the rows back so a later flush can retry them
+        with _PENDING_LOCK:
+            _PENDING_ROWS[:0] = rows
+        raise
+    logging.info(f"Predictions saved: {len(rows)} row(s) written")
+
+
+def close_predictions():
+    global _CSV_FH, _CSV_WRITER
+    try:
+        flush_predictions()
+    finally:
+        if _CSV_FH is not None:
+            _CSV_FH.close()
+            _CSV_FH = _CSV_WRITER = None
+
+
+def _close_predictions_at_exit():
+    try:
+        close_predictions()
+    except Exception as e:
+        logging.error(f"Error saving prediction: {e}; {len(_PENDING_ROWS)} row(s) lost")
+
+
+def _flush_then_destroy():
+    try:
+        close_predictions()
+    except Exception as e:
+        logging.error(f"Error saving prediction: {e}")
+        if not messagebox.askokcancel(
+            "Save Error",
+            f"Could not save {len(_PENDING_ROWS)} prediction(s): {e}\n\nClose anyway?"
+        ):
+            return
+    window.destroy()
+
+
+# Rows still buffered when the process exits some other way are written here
+atexit.register(_close_predictions_at_exit)
+
+
 def batch_predict():
     if model is None:
         messagebox.showerror("Error", "Model not loaded")
@@ -136,37 +255,78 @@ def batch_predict():
         if not input_file:
             return
 
-        data = pd.read_csv(input_file)
-        required_columns = list(FIELD_RANGES.keys())
+        required_columns = list(_FIELDS)
 
-        # Validate columns
-        if not all(col in data.columns for col in required_columns):
-            missing = set(required_columns) - set(data.columns)
+        # Validate columns from the header only
+        header = pd.read_csv(input_file, nrows=0)
+        missing = set(required_columns).difference(header.columns)
+        if missing:
             raise ValueError(f"Missing required columns: {missing}")
 
-        # Make predictions
-        predictions = model.predict(data[required_columns])
-        probabilities = model.predict_proba(data[required_columns])[:, 1]
-
-        # Add predictions to dataframe
-        data['Predicted_Outcome'] = predictions
-        data['Probability'] = probabilities
-
-        # Save results
         save_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv")]
         )
-        if save_path:
-            data.to_csv(save_path, index=False)
-            messagebox.showinfo(
-                "Success",
-                f"Batch predictions saved to {save_path}"
-            )
+        if not save_path:
+            return
 
     except Exception as e:
         logging.error(f"Batch prediction error: {e}")
         messagebox.showerror("Error", f"Batch prediction failed: {str(e)}")
+        return
+
+    # Run the prediction off the Tk main loop so the UI stays responsive
+    _EXECUTOR.submit(_run_batch_predict, input_file, save_path, required_columns)
+
+
+def _run_batch_predict(input_file, save_path, required_columns):
+    # Write to a temporary file next to the target and move it into place only
+    # once every chunk has succeeded, so a failure never leaves a partial CSV
+    tmp_path = None
+    try:
+        # Parse the model inputs directly as float64; other columns pass through
+        reader = pd.read_csv(
+            input_file,
+            dtype={col: np.float64 for col in required_columns},
+            engine='c',
+            chunksize=BATCH_CHUNK_SIZE
+        )
+
+        fd, tmp_path = tempfile.mkstemp(
+            suffix='.csv', dir=os.path.dirname(os.path.abspath(save_path))
+        )
+        with os.fdopen(fd, 'w', newline='') as f:
+            first = True
+            for chunk in reader:
+                X = chunk[required_columns].to_numpy(dtype=np.float64, copy=False)
+
+                # Add predictions to the chunk and append it to the output
+                proba = model.predict_proba(X)
+                predictions = model.classes_[proba.argmax(axis=1)]
+                chunk['Predicted_Outcome'] = np.where(predictions == 1, "Diabetic", "Non-Diabetic")
+                chunk['Probability'] = proba[:, 1].astype(np.float32)
+                chunk.to_csv(f, header=first, index=False)
+                first = False
+
+        # mkstemp creates the file 0600; give it the permissions a normal write would
+        if os.path.exists(save_path):
+            shutil.copymode(save_path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, save_path)
+        window.after(
+            0, messagebox.showinfo,
+            "Success", f"Batch predictions saved to {save_path}"
+        )
+
+    except Exception as e:
+        logging.error(f"Batch prediction error: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        window.after(
+            0, messagebox.showerror,
+            "Error", f"Batch prediction failed: {str(e)}"
+        )
 
 
 def reset_form():
@@ -175,18 +335,22 @@ def reset_form():
 
 
 def toggle_theme():
-    if window.cget("bg") == "#25446C":
+    if _dark_theme:
         set_light_theme()
     else:
         set_dark_theme()
 
 
 def set_dark_theme():
+    global _dark_theme
+    _dark_theme = True
     window.config(bg="#25446C")
     apply_theme("#25446C", "white", "#1E1E1E", "white")
 
 
 def set_light_theme():
+    global _dark_theme
+    _dark_theme = False
     window.config(bg="#FFFFFF")
     apply_theme("#FFFFFF", "black", "#F7F7F7", "black")
 
@@ -196,9 +360,8 @@ def apply_theme(bg, fg, input_bg, input_fg):
     input_frame.config(bg=bg)
     footer_frame.config(bg=bg)
 
-    for widget in input_frame.winfo_children():
-        if isinstance(widget, tk.Label):
-            widget.config(bg=bg, fg=fg)
+    for widget in _LABEL_WIDGETS:
+        widget.config(bg=bg, fg=fg)
 
     title_label.config(bg=bg, fg=fg)
     footer_label.config(bg=bg, fg=fg)
@@ -233,10 +396,11 @@ Note: All values must be within the specified ranges for accurate prediction.
 
 def create_tooltip(widget, text):
 
-    def show_tooltip(event):
+    def build_tooltip():
+        # Built once on first hover, then shown/hidden instead of recreated
         tooltip = tk.Toplevel()
         tooltip.wm_overrideredirect(True)
-        tooltip.wm_geometry(f"+{event.x_root + 25}+{event.y_root + 20}")
+        tooltip.withdraw()
 
         label = tk.Label(
             tooltip,
@@ -249,18 +413,29 @@ def create_tooltip(widget, text):
         )
         label.pack()
 
-        def hide_tooltip():
-            tooltip.destroy()
+        tooltip.timer = None
+        return tooltip
 
-        tooltip.timer = tooltip.after(2000, hide_tooltip)
-        widget.tooltip = tooltip
+    def cancel_timer(tooltip):
+        if tooltip.timer is not None:
+            tooltip.after_cancel(tooltip.timer)
+            tooltip.timer = None
+
+    def show_tooltip(event):
+        tooltip = getattr(widget, 'tooltip', None)
+        if tooltip is None:
+            tooltip = widget.tooltip = build_tooltip()
+
+        cancel_timer(tooltip)
+        tooltip.wm_geometry(f"+{event.x_root + 25}+{event.y_root + 20}")
+        tooltip.deiconify()
+        tooltip.timer = tooltip.after(2000, lambda: hide_tooltip(None))
 
     def hide_tooltip(event):
         tooltip = getattr(widget, 'tooltip', None)
         if tooltip:
-            tooltip.after_cancel(tooltip.timer)
-            tooltip.destroy()
-            widget.tooltip = None
+            cancel_timer(tooltip)
+            tooltip.withdraw()
 
     widget.bind('<Enter>', show_tooltip)
     widget.bind('<Leave>', hide_tooltip)
@@ -268,41 +443,123 @@ def create_tooltip(widget, text):
 
 
 import hashlib
+import hmac
 import sqlite3
 import re
+import bcrypt
+
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# fullmatch rather than a '$' anchor, which would accept a trailing newline
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
 
 
 class UserDatabase:
     def __init__(self, db_path='user_database.db'):
         """Initialize database connection and create users table."""
         self.db_path = db_path
+        self.conn = None
+        self.email_index = False
+        # Same SQL text every login, so sqlite3's statement cache reuses the prepared query
+        self._auth_stmt = "SELECT password FROM users WHERE username = ?"
+
+        try:
+            self.open_connection()
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Could not open database: {e}")
+            return
         self.create_user_table()
 
+    def open_connection(self):
+        """Open the connection shared for the app's lifetime."""
+        # Database calls come only from Tk callbacks, never from the background worker
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        atexit.register(self.conn.close)
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            # The default rollback journal still works, just with slower commits
+            logging.warning(f"Could not enable WAL mode: {e}")
+
+    def connection(self):
+        """Return the shared connection, raising sqlite3.Error if it never opened."""
+        if self.conn is None:
+            raise sqlite3.OperationalError("database is not open")
+        return self.conn
+
     def create_user_table(self):
         """Create users table if it doesn't exist."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS users (
-                        username TEXT PRIMARY KEY,
-                        password TEXT NOT NULL,
-                        email TEXT,
-                        full_name TEXT
-                    )
-                ''')
-                conn.commit()
+            conn = self.connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    password TEXT NOT NULL,
+                    email TEXT,
+                    full_name TEXT
+                )
+            ''')
+            conn.commit()
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Could not create user table: {e}")
+            return
+
+        self.create_email_index()
+
+    def create_email_index(self):
+        """Enforce unique emails with an index, unless existing rows already clash."""
+        try:
+            conn = self.connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT email FROM users WHERE email IS NOT NULL "
+                "GROUP BY email HAVING COUNT(*) > 1"
+            )
+            duplicates = [row[0] for row in cursor.fetchall()]
+            if duplicates:
+                messagebox.showwarning(
+                    "Database Warning",
+                    "These emails are registered to more than one user, so unique "
+                    f"emails cannot be enforced until they are resolved: {', '.join(duplicates)}"
+                )
+                return
+
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email)"
+            )
+            conn.commit()
+            self.email_index = True
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Could not create email index: {e}")
 
     def hash_password(self, password):
-        """Hash password using SHA-256."""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password using bcrypt with a per-user salt."""
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12)).decode('utf-8')
+
+    def verify_password(self, password, stored_hash):
+        """Check a password against a stored bcrypt (or legacy SHA-256) hash."""
+        if stored_hash.startswith('$2'):
+            password_bytes = password.encode('utf-8')
+            # Longer passwords can't have been registered, and bcrypt rejects them
+            if len(password_bytes) > BCRYPT_MAX_PASSWORD_BYTES:
+                return False
+            return bcrypt.checkpw(password_bytes, stored_hash.encode('utf-8'))
+        # Accounts created before the switch to bcrypt store a bare SHA-256 digest
+        legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(stored_hash, legacy_hash)
+
+    def upgrade_password_hash(self, username, password):
+        """Re-hash a legacy SHA-256 password with bcrypt after a successful login."""
+        self.connection().execute(
+            "UPDATE users SET password = ? WHERE username = ?",
+            (self.hash_password(password), username)
+        )
 
     def validate_email(self, email):
         """Validate email format using regex."""
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(email_regex, email) is not None
+        return _EMAIL_RE.fullmatch(email) is not None
 
     def register_user(self, username, password, email, full_name):
         """Register a new user with comprehensive validation."""
@@ -321,37 +578,45 @@ class UserDatabase:
             messagebox.showerror("Error", "Password must be at least 8 characters long")
             return False
 
+        # bcrypt only accepts the first 72 bytes of a password
+        if len(password.encode('utf-8')) > BCRYPT_MAX_PASSWORD_BYTES:
+            messagebox.showerror("Error", "Password must be at most 72 bytes long")
+            return False
+
         # Email validation
         if not self.validate_email(email):
             messagebox.showerror("Error", "Invalid email format")
             return False
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # Check if username already exists
-                cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-                if cursor.fetchone():
-                    messagebox.showerror("Error", "Username already exists")
-                    return False
+            conn = self.connection()
+            cursor = conn.cursor()
 
-                # Check if email already exists
-                cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
+            # Without the unique index, duplicate emails have to be checked by hand
+            if not self.email_index:
+                cursor.execute("SELECT 1 FROM users WHERE email = ? LIMIT 1", (email,))
                 if cursor.fetchone():
                     messagebox.showerror("Error", "Email already registered")
                     return False
 
-                # Insert new user
-                hashed_password = self.hash_password(password)
+            # Insert new user; duplicates are rejected by the unique constraints
+            hashed_password = self.hash_password(password)
+            try:
                 cursor.execute(
                     "INSERT INTO users (username, password, email, full_name) VALUES (?, ?, ?, ?)",
                     (username, hashed_password, email, full_name)
                 )
-                conn.commit()
+            except sqlite3.IntegrityError as e:
+                conn.rollback()
+                if "users.email" in e.args[0]:
+                    messagebox.showerror("Error", "Email already registered")
+                else:
+                    messagebox.showerror("Error", "Username already exists")
+                return False
+            conn.commit()
 
-                messagebox.showinfo("Success", "User registered successfully")
-                return True
+            messagebox.showinfo("Success", "User registered successfully")
+            return True
 
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Registration failed: {e}")
@@ -360,19 +625,21 @@ class UserDatabase:
     def authenticate_user(self, username, password):
         """Authenticate user credentials."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # Retrieve user's hashed password
-                cursor.execute("SELECT password FROM users WHERE username = ?", (username,))
-                result = cursor.fetchone()
-
-                # Check credentials
-                if result and result[0] == self.hash_password(password):
-                    return True
-                else:
-                    messagebox.showerror("Login Failed", "Invalid username or password")
-                    return False
+            # Retrieve user's hashed password
+            conn = self.connection()
+            result = conn.execute(self._auth_stmt, (username,)).fetchone()
+
+            # Check credentials
+            if result and self.verify_password(password, result[0]):
+                # Legacy passwords too long for bcrypt keep their SHA-256 hash
+                if (not result[0].startswith('$2')
+                        and len(password.encode('utf-8')) <= BCRYPT_MAX_PASSWORD_BYTES):
+                    self.upgrade_password_hash(username, password)
+                    conn.commit()
+                return True
+            else:
+                messagebox.showerror("Login Failed", "Invalid username or password")
+                return False
 
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Login failed: {e}")
@@ -569,69 +836,6 @@ class LoginRegistrationApp:
         )
         requirements_label.pack(pady=5)
 
-        def register_user(self, username, password, email, full_name):
-            """Register a new user with comprehensive validation."""
-            print(f"Attempting to register: {username}, {email}")  # Debug print
-
-            # Input validation
-            if not all([username, password, email, full_name]):
-                print("Registration failed: All fields are required")  # Debug print
-                messagebox.showerror("Error", "All fields are required")
-                return False
-
-            # Username validation
-            if len(username) < 4:
-                print("Registration failed: Username too short")  # Debug print
-                messagebox.showerror("Error", "Username must be at least 4 characters long")
-                return False
-
-            # Password strength validation
-            if len(password) < 8:
-                print("Registration failed: Password too short")  # Debug print
-                messagebox.showerror("Error", "Password must be at least 8 characters long")
-                return False
-
-            # Email validation
-            if not self.validate_email(email):
-                print("Registration failed: Invalid email")  # Debug print
-                messagebox.showerror("Error", "Invalid email format")
-                return False
-
-            try:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.cursor()
-
-                    # Check if username already exists
-                    cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-                    if cursor.fetchone():
-                        print(f"Registration failed: Username {username} already exists")  # Debug print
-                        messagebox.showerror("Error", "Username already exists")
-                        return False
-
-                    # Check if email already exists
-                    cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
-                    if cursor.fetchone():
-                        print(f"Registration failed: Email {email} already registered")  # Debug print
-                        messagebox.showerror("Error", "Email already registered")
-                        return False
-
-                    # Insert new user
-                    hashed_password = self.hash_password(password)
-                    cursor.execute(
-                        "INSERT INTO users (username, password, email, full_name) VALUES (?, ?, ?, ?)",
-                        (username, hashed_password, email, full_name)
-                    )
-                    conn.commit()
-
-                    print("User registered successfully")  # Debug print
-                    messagebox.showinfo("Success", "User registered successfully")
-                    return True
-
-            except sqlite3.Error as e:
-                print(f"Database Error during registration: {e}")  # Debug print
-                messagebox.showerror("Database Error", f"Registration failed: {e}")
-                return False
-
         reg_window.mainloop()
 
 
@@ -644,7 +848,7 @@ def main():
         except:
             pass
 
-        global window, model, entry_vars, title_label, footer_label,title_frame, input_frame, footer_frame
+        global window, predict_button, batch_button, entry_vars, title_label, footer_label,title_frame, input_frame, footer_frame
         window = tk.Tk()
         window.title("Diabetes Prediction System")
         window.geometry("600x750")
@@ -655,9 +859,6 @@ def main():
         window.title("Diabetes Prediction System")
         window.geometry("600x750")
 
-        # Load model
-        model = load_model()
-
         title_frame = tk.Frame(window)
         title_frame.pack(fill=tk.X)
 
@@ -674,12 +875,13 @@ def main():
         input_frame = tk.Frame(window, padx=20, pady=20, relief="sunken")
         input_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        fields = list(FIELD_RANGES.keys())
+        fields = _FIELDS
         entry_vars = [tk.StringVar() for _ in fields]
 
         for idx, (field, var) in enumerate(zip(fields, entry_vars)):
             label = tk.Label(input_frame, text=field, font=("Helvetica", 12))
             label.grid(row=idx, column=0, sticky="w", pady=10)
+            _LABEL_WIDGETS.append(label)
 
             entry = ttk.Entry(input_frame, textvariable=var, font=("Helvetica", 12), width=30)
             entry.grid(row=idx, column=1, pady=10)
@@ -690,9 +892,12 @@ def main():
         buttons_frame = tk.Frame(window, bg="#25446C")
         buttons_frame.pack(pady=10)
 
-        ttk.Button(buttons_frame, text="Predict", command=predict_diabetes).pack(side=tk.LEFT, padx=5)
+        # Model-dependent buttons stay disabled until the model has loaded
+        predict_button = ttk.Button(buttons_frame, text="Predict", command=predict_diabetes, state=tk.DISABLED)
+        predict_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(buttons_frame, text="Reset", command=reset_form).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Batch Predict", command=batch_predict).pack(side=tk.LEFT, padx=5)
+        batch_button = ttk.Button(buttons_frame, text="Batch Predict", command=batch_predict, state=tk.DISABLED)
+        batch_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(buttons_frame, text="Toggle Theme", command=toggle_theme).pack(side=tk.LEFT, padx=5)
         ttk.Button(buttons_frame, text="Help", command=show_help).pack(side=tk.LEFT, padx=5)
 
@@ -707,6 +912,11 @@ def main():
 
         set_dark_theme()
 
+        # Write any buffered predictions before the window closes
+        window.protocol("WM_DELETE_WINDOW", _flush_then_destroy)
+
+        window.after(50, _check_model_ready)
+
         window.mainloop()
 
     login_app = LoginRegistrationApp(start_main_application)